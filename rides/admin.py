@@ -1,8 +1,29 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from .counts import ESTIMATE_THRESHOLD, estimated_row_count
 from .models import User, Ride, RideEvent
 
 
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that uses PostgreSQL's row estimate for large unfiltered changelists.
+    Filtered and searched lists, and small tables, still get an exact COUNT(*).
+    """
+    
+    estimate_threshold = ESTIMATE_THRESHOLD
+    
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, using=queryset.db)
+            if estimate >= self.estimate_threshold:
+                return estimate
+        return super().count
+
+
 class UserAdmin(BaseUserAdmin):
     """Admin configuration for the custom User model."""
     
@@ -45,6 +66,11 @@ class RideEventAdmin(admin.ModelAdmin):
     search_fields = ('description', 'id_ride__id_ride')
     ordering = ('-created_at',)
     date_hierarchy = 'created_at'
+    # The ride column renders Ride.__str__, which only reads the ride's own columns
+    list_select_related = ('id_ride',)
+    # Skip the unfiltered COUNT(*) behind the "X of Y" label
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     
     fieldsets = (
         ('Event Information', {
@@ -56,10 +82,6 @@ class RideEventAdmin(admin.ModelAdmin):
     )
     
     readonly_fields = ('created_at',)
-    
-    def get_queryset(self, request):
-        """Optimize queryset with select_related for better performance."""
-        return super().get_queryset(request).select_related('id_ride')
 
 
 class RideAdmin(admin.ModelAdmin):
@@ -67,9 +89,15 @@ class RideAdmin(admin.ModelAdmin):
     
     list_display = ('id_ride', 'status', 'id_rider', 'id_driver', 'pickup_time', 'created_at')
     list_filter = ('status', 'pickup_time', 'created_at')
-    search_fields = ('id_rider__email', 'id_driver__email', 'id_rider__first_name', 'id_rider__last_name')
+    # Denormalized emails on the ride, so searching needs no joins
+    search_fields = ('rider_email', 'driver_email')
+    search_help_text = 'Search by rider or driver email.'
     ordering = ('-pickup_time',)
     date_hierarchy = 'pickup_time'
+    list_select_related = ('id_rider', 'id_driver')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    autocomplete_fields = ('id_rider', 'id_driver')
     inlines = [RideEventInline]
     
     fieldsets = (
@@ -92,10 +120,9 @@ class RideAdmin(admin.ModelAdmin):
     )
     
     readonly_fields = ('created_at', 'updated_at')
-    inlines = [RideEventInline]
     
     def get_queryset(self, request):
-        """Optimize queryset with select_related for better performance."""
+        """Join rider and driver so the change and delete pages can render the ride."""
         return super().get_queryset(request).select_related('id_rider', 'id_driver')
 
 
@@ -0,0 +1,33 @@
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+
+from .cache_keys import shared_cache_enabled
+
+
+# Seconds a token's user stays cached
+TOKEN_CACHE_TIMEOUT = 60
+
+
+def token_cache_key(key):
+    """Return the cache key for an API token."""
+    return f'auth:token:{key}'
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that caches the token's user.
+    Saves the token/user SELECT on repeat requests; entries are dropped when
+    the user or token changes (see rides.signals). Only used with a shared cache
+    backend, so deactivating a user or deleting a token takes effect in every worker.
+    """
+
+    def authenticate_credentials(self, key):
+        if not shared_cache_enabled():
+            return super().authenticate_credentials(key)
+        cache_key = token_cache_key(key)
+        credentials = cache.get(cache_key)
+        if credentials is None:
+            # Raises for unknown tokens and inactive users, so only valid credentials are cached
+            credentials = super().authenticate_credentials(key)
+            cache.set(cache_key, credentials, TOKEN_CACHE_TIMEOUT)
+        return credentials
@@ -0,0 +1,21 @@
+from django.conf import settings
+
+
+# Keys of the cached stats responses. The views fill them and rides.signals
+# drops them on writes, so both import them from here.
+USER_STATS_CACHE_KEY = 'stats:users'
+RIDE_EVENT_STATS_CACHE_KEY = 'stats:ride_events'
+EVENT_TYPES_CACHE_KEY = 'stats:ride_event_types'
+
+# Cache backends shared by all worker processes. With a per-process cache such as
+# LocMemCache, signals could only drop an entry in the worker that made the write.
+SHARED_CACHE_BACKENDS = frozenset([
+    'django.core.cache.backends.redis.RedisCache',
+    'django.core.cache.backends.memcached.PyMemcacheCache',
+    'django.core.cache.backends.memcached.PyLibMCCache',
+])
+
+
+def shared_cache_enabled():
+    """Return True if the default cache is shared across processes, so entries dropped on writes are gone everywhere."""
+    return settings.CACHES.get('default', {}).get('BACKEND') in SHARED_CACHE_BACKENDS
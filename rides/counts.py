@@ -0,0 +1,20 @@
+from django.db import connections
+
+
+# Below this many rows an exact count is cheap enough
+ESTIMATE_THRESHOLD = 10000
+
+
+def estimated_row_count(model, using='default'):
+    """
+    Return PostgreSQL's planner estimate of a model table's row count.
+    A catalog lookup instead of a full scan; -1 until the table has been vacuumed or analyzed.
+    """
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [connection.ops.quote_name(model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else -1
@@ -0,0 +1,38 @@
+from hashlib import md5
+from uuid import uuid4
+
+from django.core.cache import cache
+
+from .cache_keys import shared_cache_enabled
+
+
+# Seconds a users version stays valid; also bounds staleness after bulk writes,
+# which skip the post_save signal
+USERS_ETAG_TIMEOUT = 60
+USERS_VERSION_CACHE_KEY = 'etag:users:version'
+
+
+def invalidate_users_etag():
+    """Start a new users version, so user-derived ETags stop matching."""
+    cache.delete(USERS_VERSION_CACHE_KEY)
+
+
+def users_version():
+    """Return the current users version, starting a new one if it has expired."""
+    return cache.get_or_set(USERS_VERSION_CACHE_KEY, lambda: uuid4().hex, USERS_ETAG_TIMEOUT)
+
+
+def users_etag(request, *args, **kwargs):
+    """
+    ETag for responses derived from the user table (stats, drivers, riders).
+    Computed from the cached users version without touching the database; it also
+    varies by Accept and requesting user, since the browsable API shows the username.
+    Returns None (no ETag) unless the cache is shared: with a per-process cache a
+    write only starts a new version in its own worker, and the others would keep
+    answering 304 for up to USERS_ETAG_TIMEOUT.
+    """
+    if not shared_cache_enabled():
+        return None
+    version = users_version()
+    accept = request.META.get('HTTP_ACCEPT', '')
+    return md5(f'{version}:{accept}:{request.user.pk}'.encode()).hexdigest()
@@ -0,0 +1,59 @@
+import math
+
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models
+
+
+def validate_finite(value):
+    if value is not None and not math.isfinite(value):
+        raise ValidationError("Ensure this value is a finite number.", code='finite')
+
+
+class CoordinateField(models.FloatField):
+    """
+    A latitude or longitude in degrees, stored as a fixed-point integer.
+    The column holds degrees * 1e7 in 4 bytes (about 1 cm of precision) instead of
+    an 8-byte double; Python code and lookups keep working in float degrees.
+    Raw SQL must divide the column by SCALE.
+    Pass max_degrees=90 for latitudes and 180 for longitudes so forms and
+    serializers reject out-of-range values before they reach the database.
+    """
+    
+    SCALE = 10_000_000
+    # Largest magnitude that fits the integer column once scaled
+    MAX_DEGREES = (2 ** 31 - 1) / SCALE
+    
+    def __init__(self, *args, max_degrees=None, **kwargs):
+        self.max_degrees = max_degrees
+        super().__init__(*args, **kwargs)
+    
+    @property
+    def default_validators(self):
+        limit = self.MAX_DEGREES if self.max_degrees is None else self.max_degrees
+        return [validate_finite, MinValueValidator(-limit), MaxValueValidator(limit)]
+    
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.max_degrees is not None:
+            kwargs['max_degrees'] = self.max_degrees
+        return name, path, args, kwargs
+    
+    def db_type(self, connection):
+        return 'integer'
+    
+    def get_db_prep_value(self, value, connection, prepared=False):
+        value = super().get_db_prep_value(value, connection, prepared)
+        if value is None:
+            return None
+        if not math.isfinite(value) or abs(value) > self.MAX_DEGREES:
+            raise ValueError(
+                f"Coordinate must be a finite number of degrees within "
+                f"±{self.MAX_DEGREES:.2f}, got {value!r}."
+            )
+        return round(value * self.SCALE)
+    
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return value / self.SCALE
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+import django_filters
+
+from .models import RideEvent
+
+
+def parse_iso_datetime(value):
+    """Parse an ISO 8601 query parameter (a trailing Z is accepted), or return None if invalid."""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+class RideEventFilter(django_filters.FilterSet):
+    """
+    Query parameters for the ride event list.
+    Invalid start_date/end_date values are ignored rather than rejected.
+    """
+    
+    ride_id = django_filters.NumberFilter(field_name='id_ride')
+    description = django_filters.CharFilter(lookup_expr='icontains')
+    start_date = django_filters.CharFilter(method='filter_start_date')
+    end_date = django_filters.CharFilter(method='filter_end_date')
+    
+    class Meta:
+        model = RideEvent
+        fields = ['id_ride', 'id_ride__status']
+    
+    def filter_start_date(self, queryset, name, value):
+        start = parse_iso_datetime(value)
+        return queryset if start is None else queryset.filter(created_at__gte=start)
+    
+    def filter_end_date(self, queryset, name, value):
+        end = parse_iso_datetime(value)
+        return queryset if end is None else queryset.filter(created_at__lte=end)
@@ -1,5 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 
 User = get_user_model()
 
@@ -20,38 +23,31 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
+        users = []
         if options['create_admin']:
-            self.create_admin_user()
+            users.append(self.build_admin_user())
         
         if options['create_test_users']:
-            self.create_test_users()
+            users.extend(self.build_test_users())
+        
+        if users:
+            self.save_users(users)
 
-    def create_admin_user(self):
-        """Create an admin user for testing."""
-        try:
-            admin_user = User.objects.create_user(
-                email='admin@wingz.com',
-                password='admin123',
-                first_name='Admin',
-                last_name='User',
-                phone_number='555-0001',
-                role='admin'
-            )
-            admin_user.is_staff = True
-            admin_user.is_superuser = True
-            admin_user.save()
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f'Successfully created admin user: {admin_user.email}'
-                )
-            )
-        except Exception as e:
-            self.stdout.write(
-                self.style.ERROR(f'Error creating admin user: {e}')
-            )
+    def build_admin_user(self):
+        """Build an admin user for testing."""
+        return User(
+            email='admin@wingz.com',
+            password='admin123',
+            first_name='Admin',
+            last_name='User',
+            phone_number='555-0001',
+            role='admin',
+            is_staff=True,
+            is_superuser=True,
+        )
 
-    def create_test_users(self):
-        """Create test users with different roles."""
+    def build_test_users(self):
+        """Build test users with different roles."""
         test_users = [
             {
                 'email': 'driver@wingz.com',
@@ -79,17 +75,44 @@ class Command(BaseCommand):
             }
         ]
 
-        for user_data in test_users:
-            try:
-                user = User.objects.create_user(**user_data)
+        return [User(**user_data) for user_data in test_users]
+
+    def save_users(self, users):
+        """
+        Insert the users that don't exist yet in a single query.
+        Existing accounts are left untouched, passwords and privileges included.
+        """
+        existing = set(
+            User.objects.filter(email__in=[user.email for user in users]).values_list('email', flat=True)
+        )
+        new_users = [user for user in users if user.email not in existing]
+
+        # Hashing dominates this command; PBKDF2 releases the GIL, so the
+        # raw passwords set by the build_* methods are hashed in parallel.
+        with ThreadPoolExecutor() as pool:
+            hashed = list(pool.map(make_password, [user.password for user in new_users]))
+        for user, password in zip(new_users, hashed):
+            user.password = password
+
+        try:
+            # ignore_conflicts also skips accounts created since the lookup above
+            User.objects.bulk_create(new_users, ignore_conflicts=True)
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f'Error creating users: {e}')
+            )
+            return
+
+        for user in users:
+            if user.email in existing:
                 self.stdout.write(
-                    self.style.SUCCESS(
-                        f'Successfully created {user_data["role"]} user: {user.email}'
+                    self.style.WARNING(
+                        f'{user.role.capitalize()} user already exists, left unchanged: {user.email}'
                     )
                 )
-            except Exception as e:
+            else:
                 self.stdout.write(
-                    self.style.ERROR(
-                        f'Error creating {user_data["role"]} user: {e}'
+                    self.style.SUCCESS(
+                        f'Successfully created {user.role} user: {user.email}'
                     )
                 )
@@ -1,4 +1,5 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from django.utils import timezone
 from rides.models import User, Ride, RideEvent
 import random
@@ -8,91 +9,100 @@ class Command(BaseCommand):
     help = 'Populate the database with test users and rides.'
 
     def handle(self, *args, **options):
-        # Create users
-        users = []
-        roles = ['rider', 'driver']
-        for i in range(1, 7):
-            for role in roles:
-                email = f'{role}{i}@example.com'
-                user, created = User.objects.get_or_create(
-                    email=email,
-                    defaults={
-                        'first_name': f'{role.capitalize()}{i}',
-                        'last_name': 'Test',
-                        'phone_number': f'555-000{i}{1 if role=="rider" else 2}',
-                        'role': role,
-                        'is_active': True,
-                    }
+        # One transaction for the whole run: a single commit, and no partial data on failure
+        with transaction.atomic():
+            # Create users
+            desired = []
+            roles = ['rider', 'driver']
+            for i in range(1, 7):
+                for role in roles:
+                    desired.append(User(
+                        email=f'{role}{i}@example.com',
+                        first_name=f'{role.capitalize()}{i}',
+                        last_name='Test',
+                        phone_number=f'555-000{i}{1 if role=="rider" else 2}',
+                        role=role,
+                        is_active=True,
+                    ))
+            # Add at least one admin and one dispatcher
+            desired.append(User(
+                email='admin@example.com',
+                first_name='Admin',
+                last_name='User',
+                phone_number='555-ADMIN',
+                role='admin',
+                is_active=True,
+                is_staff=True,
+                is_superuser=True,
+            ))
+            desired.append(User(
+                email='dispatcher@example.com',
+                first_name='Dispatcher',
+                last_name='User',
+                phone_number='555-DISPATCH',
+                role='dispatcher',
+                is_active=True,
+            ))
+            # Existing users are left untouched, matching get_or_create semantics
+            User.objects.bulk_create(desired, ignore_conflicts=True)
+
+            # Only the primary key and email are needed to assign rides
+            riders, drivers = [], []
+            for user in User.objects.filter(role__in=['rider', 'driver'], is_active=True).only('id_user', 'role', 'email'):
+                (riders if user.role == 'rider' else drivers).append(user)
+
+            # Create rides
+            ride_count = Ride.objects.count()
+            rides_to_create = max(0, 12 - ride_count)
+            # Draw all random values up front instead of several calls per ride
+            rider_picks = random.choices(riders, k=rides_to_create)
+            driver_picks = random.choices(drivers, k=rides_to_create)
+            status_picks = random.choices(['en-route', 'pickup', 'dropoff', 'completed', 'cancelled'], k=rides_to_create)
+            hours_ago = random.choices(range(49), k=rides_to_create)
+            jitter = iter([random.uniform(-0.01, 0.01) for _ in range(4 * rides_to_create)])
+            now = timezone.now()
+            rides = [
+                Ride(
+                    status=status,
+                    id_rider=rider,
+                    id_driver=driver,
+                    rider_email=rider.email,
+                    driver_email=driver.email,
+                    pickup_latitude=37.77 + next(jitter),
+                    pickup_longitude=-122.41 + next(jitter),
+                    dropoff_latitude=37.78 + next(jitter),
+                    dropoff_longitude=-122.42 + next(jitter),
+                    pickup_time=now - timedelta(hours=hours)
                 )
-                users.append(user)
-        # Add at least one admin and one dispatcher
-        admin, _ = User.objects.get_or_create(
-            email='admin@example.com',
-            defaults={
-                'first_name': 'Admin',
-                'last_name': 'User',
-                'phone_number': '555-ADMIN',
-                'role': 'admin',
-                'is_active': True,
-                'is_staff': True,
-                'is_superuser': True,
-            }
-        )
-        dispatcher, _ = User.objects.get_or_create(
-            email='dispatcher@example.com',
-            defaults={
-                'first_name': 'Dispatcher',
-                'last_name': 'User',
-                'phone_number': '555-DISPATCH',
-                'role': 'dispatcher',
-                'is_active': True,
-            }
-        )
-        users.extend([admin, dispatcher])
-        riders = [u for u in users if u.role == 'rider']
-        drivers = [u for u in users if u.role == 'driver']
+                for rider, driver, status, hours in zip(rider_picks, driver_picks, status_picks, hours_ago)
+            ]
+            # Insert all rides at once (bulk_create skips save(), so emails are set above);
+            # PostgreSQL returns the new primary keys
+            Ride.objects.bulk_create(rides)
 
-        # Create rides
-        ride_count = Ride.objects.count()
-        rides_to_create = max(0, 12 - ride_count)
-        for i in range(rides_to_create):
-            rider = random.choice(riders)
-            driver = random.choice(drivers)
-            pickup_lat = 37.77 + random.uniform(-0.01, 0.01)
-            pickup_lon = -122.41 + random.uniform(-0.01, 0.01)
-            dropoff_lat = 37.78 + random.uniform(-0.01, 0.01)
-            dropoff_lon = -122.42 + random.uniform(-0.01, 0.01)
-            pickup_time = timezone.now() - timedelta(hours=random.randint(0, 48))
-            status = random.choice(['en-route', 'pickup', 'dropoff', 'completed', 'cancelled'])
-            ride = Ride.objects.create(
-                status=status,
-                id_rider=rider,
-                id_driver=driver,
-                pickup_latitude=pickup_lat,
-                pickup_longitude=pickup_lon,
-                dropoff_latitude=dropoff_lat,
-                dropoff_longitude=dropoff_lon,
-                pickup_time=pickup_time
-            )
             # Create RideEvents for each ride
-            # Always create at least one event in the last 24 hours
-            event_time = timezone.now() - timedelta(hours=random.randint(0, 23), minutes=random.randint(0, 59))
-            RideEvent.objects.create(
-                id_ride=ride,
-                description=f"Status changed to {status}",
-                created_at=event_time
-            )
-            # Optionally add a pickup and dropoff event, possibly outside 24h
-            if random.random() > 0.5:
-                RideEvent.objects.create(
-                    id_ride=ride,
-                    description="Pickup completed",
-                    created_at=pickup_time + timedelta(minutes=5)
-                )
-            if random.random() > 0.5:
-                RideEvent.objects.create(
+            events = []
+            for ride in rides:
+                # Always create at least one event in the last 24 hours
+                event_time = now - timedelta(hours=random.randint(0, 23), minutes=random.randint(0, 59))
+                events.append(RideEvent(
                     id_ride=ride,
-                    description="Dropoff completed",
-                    created_at=pickup_time + timedelta(minutes=30)
-                )
+                    description=f"Status changed to {ride.status}",
+                    created_at=event_time
+                ))
+                # Optionally add a pickup and dropoff event, possibly outside 24h
+                if random.random() > 0.5:
+                    events.append(RideEvent(
+                        id_ride=ride,
+                        description="Pickup completed",
+                        created_at=ride.pickup_time + timedelta(minutes=5)
+                    ))
+                if random.random() > 0.5:
+                    events.append(RideEvent(
+                        id_ride=ride,
+                        description="Dropoff completed",
+                        created_at=ride.pickup_time + timedelta(minutes=30)
+                    ))
+            RideEvent.objects.bulk_create(events, batch_size=500)
+
         self.stdout.write(self.style.SUCCESS('Test users and rides created.'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = 'Refresh the ride_event_type_counts materialized view used by the ride event stats.'
+
+    def handle(self, *args, **options):
+        # CONCURRENTLY keeps the view readable while it is rebuilt
+        with connection.cursor() as cursor:
+            cursor.execute('REFRESH MATERIALIZED VIEW CONCURRENTLY ride_event_type_counts')
+
+        self.stdout.write(self.style.SUCCESS('Ride event type counts refreshed.'))
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0003_rideevent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ride',
+            index=models.Index(fields=['status', '-pickup_time'], name='ride_status_9d6478_idx'),
+        ),
+    ]
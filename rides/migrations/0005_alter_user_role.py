@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0004_ride_ride_status_9d6478_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='role',
+            field=models.CharField(choices=[('admin', 'Admin'), ('driver', 'Driver'), ('rider', 'Rider'), ('dispatcher', 'Dispatcher')], db_index=True, default='rider', help_text='User role (admin, driver, rider, dispatcher)', max_length=20),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:17
+
+from django.db import migrations, models
+import django.db.models.functions.datetime
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0005_alter_user_role'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ride',
+            index=models.Index(django.db.models.functions.datetime.TruncYear('pickup_time'), name='ride_pickup_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ride',
+            index=models.Index(django.db.models.functions.datetime.TruncMonth('pickup_time'), name='ride_pickup_month_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rideevent',
+            index=models.Index(django.db.models.functions.datetime.TruncYear('created_at'), name='ride_event_created_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rideevent',
+            index=models.Index(django.db.models.functions.datetime.TruncMonth('created_at'), name='ride_event_created_month_idx'),
+        ),
+    ]
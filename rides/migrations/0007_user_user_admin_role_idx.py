@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0006_ride_ride_pickup_year_idx_ride_ride_pickup_month_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('role', 'admin')), fields=['role'], name='user_admin_role_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0007_user_user_admin_role_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='rideevent',
+            name='ride_event_created_fda889_idx',
+        ),
+        migrations.AddIndex(
+            model_name='rideevent',
+            index=models.Index(fields=['-created_at'], include=('id_ride_event', 'id_ride', 'description'), name='ride_event_recent_covering_idx'),
+        ),
+    ]
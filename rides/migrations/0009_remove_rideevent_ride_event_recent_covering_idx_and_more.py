@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:23
+
+from django.db import migrations, models
+
+
+def set_event_types(apps, schema_editor):
+    """Backfill event_type from the description, pickup taking precedence."""
+    RideEvent = apps.get_model('rides', 'RideEvent')
+    RideEvent.objects.filter(description__icontains='dropoff').update(event_type=2)
+    RideEvent.objects.filter(description__icontains='pickup').update(event_type=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0008_remove_rideevent_ride_event_created_fda889_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='rideevent',
+            name='ride_event_recent_covering_idx',
+        ),
+        migrations.AddField(
+            model_name='rideevent',
+            name='event_type',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Other'), (1, 'Pickup'), (2, 'Dropoff')], default=0, editable=False, help_text='Event type, derived from the description on save'),
+        ),
+        migrations.RunPython(set_event_types, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='rideevent',
+            index=models.Index(fields=['-created_at'], include=('id_ride_event', 'id_ride', 'description', 'event_type'), name='ride_event_recent_covering_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rideevent',
+            index=models.Index(fields=['event_type', 'created_at'], name='ride_event_event_t_742a5d_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0009_remove_rideevent_ride_event_recent_covering_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='ride',
+            name='ride_status_4ce3bb_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='ride',
+            name='ride_id_ride_030ef8_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='ride',
+            name='ride_id_driv_1d5b88_idx',
+        ),
+        migrations.AddIndex(
+            model_name='ride',
+            index=models.Index(condition=models.Q(('status__in', ['completed', 'cancelled']), _negated=True), fields=['id_driver'], name='ride_active_driver_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:24
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0010_remove_ride_ride_status_4ce3bb_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='rideevent',
+            name='ride_event_recent_covering_idx',
+        ),
+        migrations.AddIndex(
+            model_name='rideevent',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='ride_event_created_brin', pages_per_range=32),
+        ),
+        migrations.AddIndex(
+            model_name='rideevent',
+            index=models.Index(fields=['-created_at'], include=('id_ride_event', 'description'), name='ride_event_created_at_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:25
+
+from django.db import migrations, models
+
+
+def copy_user_emails(apps, schema_editor):
+    """Backfill the denormalized rider and driver emails."""
+    Ride = apps.get_model('rides', 'Ride')
+    User = apps.get_model('rides', 'User')
+    Ride.objects.update(
+        rider_email=models.Subquery(User.objects.filter(pk=models.OuterRef('id_rider')).values('email')[:1]),
+        driver_email=models.Subquery(User.objects.filter(pk=models.OuterRef('id_driver')).values('email')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0011_remove_rideevent_ride_event_recent_covering_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ride',
+            name='driver_email',
+            field=models.EmailField(default='', editable=False, help_text="Driver's email (denormalized)", max_length=254),
+        ),
+        migrations.AddField(
+            model_name='ride',
+            name='rider_email',
+            field=models.EmailField(default='', editable=False, help_text="Rider's email (denormalized)", max_length=254),
+        ),
+        migrations.RunPython(copy_user_emails, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:26
+
+from django.db import migrations
+import rides.fields
+
+
+COORDINATE_COLUMNS = ['pickup_latitude', 'pickup_longitude', 'dropoff_latitude', 'dropoff_longitude']
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0012_ride_driver_email_ride_rider_email'),
+    ]
+
+    operations = [
+        # A plain ALTER ... TYPE integer would truncate the degrees, so scale them explicitly
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    'ALTER TABLE "ride" ' + ', '.join(
+                        f'ALTER COLUMN "{column}" TYPE integer USING round("{column}" * 1e7)'
+                        for column in COORDINATE_COLUMNS
+                    ),
+                    'ALTER TABLE "ride" ' + ', '.join(
+                        f'ALTER COLUMN "{column}" TYPE double precision USING "{column}" / 1e7'
+                        for column in COORDINATE_COLUMNS
+                    ),
+                ),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='ride',
+                    name='dropoff_latitude',
+                    field=rides.fields.CoordinateField(help_text='Latitude of dropoff location'),
+                ),
+                migrations.AlterField(
+                    model_name='ride',
+                    name='dropoff_longitude',
+                    field=rides.fields.CoordinateField(help_text='Longitude of dropoff location'),
+                ),
+                migrations.AlterField(
+                    model_name='ride',
+                    name='pickup_latitude',
+                    field=rides.fields.CoordinateField(help_text='Latitude of pickup location'),
+                ),
+                migrations.AlterField(
+                    model_name='ride',
+                    name='pickup_longitude',
+                    field=rides.fields.CoordinateField(help_text='Longitude of pickup location'),
+                ),
+            ],
+        ),
+    ]
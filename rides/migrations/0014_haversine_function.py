@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:27
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0013_alter_ride_dropoff_latitude_and_more'),
+    ]
+
+    operations = [
+        # Great-circle distance in kilometers between two points given in degrees
+        migrations.RunSQL(
+            """
+            CREATE OR REPLACE FUNCTION haversine(
+                lat1 double precision, lon1 double precision,
+                lat2 double precision, lon2 double precision
+            ) RETURNS double precision AS $$
+                SELECT 2 * 6371 * asin(sqrt(
+                    sin(radians(lat2 - lat1) / 2) ^ 2
+                    + cos(radians(lat1)) * cos(radians(lat2)) * sin(radians(lon2 - lon1) / 2) ^ 2
+                ))
+            $$ LANGUAGE SQL IMMUTABLE STRICT PARALLEL SAFE;
+            """,
+            'DROP FUNCTION IF EXISTS haversine(double precision, double precision, double precision, double precision);',
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-15 07:05
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0014_haversine_function'),
+    ]
+
+    operations = [
+        # Trigram index for the user search filter, which runs UPPER(col::text) LIKE '%q%'
+        # on each search field. pg_trgm ships with postgresql-contrib; without it the
+        # migration is a no-op and search keeps using a sequential scan.
+        migrations.RunSQL(
+            """
+            DO $$
+            BEGIN
+                IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+                    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                    CREATE INDEX IF NOT EXISTS user_search_trgm_idx ON "user" USING gin (
+                        UPPER(first_name::text) gin_trgm_ops,
+                        UPPER(last_name::text) gin_trgm_ops,
+                        UPPER(email::text) gin_trgm_ops,
+                        UPPER(phone_number::text) gin_trgm_ops
+                    );
+                END IF;
+            END
+            $$;
+            """,
+            'DROP INDEX IF EXISTS user_search_trgm_idx;',
+        ),
+    ]
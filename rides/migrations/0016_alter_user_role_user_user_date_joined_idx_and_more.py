@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0015_user_search_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='role',
+            field=models.CharField(choices=[('admin', 'Admin'), ('driver', 'Driver'), ('rider', 'Rider'), ('dispatcher', 'Dispatcher')], default='rider', help_text='User role (admin, driver, rider, dispatcher)', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-date_joined'], name='user_date_joined_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', 'is_active', '-date_joined'], name='user_role_active_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0016_alter_user_role_user_user_date_joined_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rideevent',
+            index=models.Index(fields=['description'], name='ride_event_description_idx'),
+        ),
+    ]
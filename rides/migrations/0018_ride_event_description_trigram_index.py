@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-15 07:48
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0017_rideevent_ride_event_description_idx'),
+    ]
+
+    operations = [
+        # Trigram index for the description filter and search, which run
+        # UPPER(description::text) LIKE '%q%'. A no-op without pg_trgm, as in 0015.
+        migrations.RunSQL(
+            """
+            DO $$
+            BEGIN
+                IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+                    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                    CREATE INDEX IF NOT EXISTS ride_event_description_trgm_idx ON ride_event
+                        USING gin (UPPER(description::text) gin_trgm_ops);
+                END IF;
+            END
+            $$;
+            """,
+            'DROP INDEX IF EXISTS ride_event_description_trgm_idx;',
+        ),
+    ]
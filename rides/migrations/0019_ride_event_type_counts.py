@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0018_ride_event_description_trigram_index'),
+    ]
+
+    operations = [
+        # Per-description event counts for the event stats. The unique index lets
+        # REFRESH MATERIALIZED VIEW CONCURRENTLY run without blocking readers.
+        migrations.RunSQL(
+            """
+            CREATE MATERIALIZED VIEW ride_event_type_counts AS
+                SELECT description, COUNT(*) AS count
+                FROM ride_event
+                GROUP BY description;
+            CREATE UNIQUE INDEX ride_event_type_counts_description_idx
+                ON ride_event_type_counts (description);
+            CREATE INDEX ride_event_type_counts_count_idx
+                ON ride_event_type_counts (count DESC);
+            """,
+            'DROP MATERIALIZED VIEW IF EXISTS ride_event_type_counts;',
+        ),
+        migrations.CreateModel(
+            name='RideEventTypeCount',
+            fields=[
+                ('description', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('count', models.PositiveIntegerField()),
+            ],
+            options={
+                'db_table': 'ride_event_type_counts',
+                'ordering': ['-count'],
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-15 07:07
+
+from django.db import migrations
+import rides.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rides', '0019_ride_event_type_counts'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ride',
+            name='dropoff_latitude',
+            field=rides.fields.CoordinateField(help_text='Latitude of dropoff location', max_degrees=90),
+        ),
+        migrations.AlterField(
+            model_name='ride',
+            name='dropoff_longitude',
+            field=rides.fields.CoordinateField(help_text='Longitude of dropoff location', max_degrees=180),
+        ),
+        migrations.AlterField(
+            model_name='ride',
+            name='pickup_latitude',
+            field=rides.fields.CoordinateField(help_text='Latitude of pickup location', max_degrees=90),
+        ),
+        migrations.AlterField(
+            model_name='ride',
+            name='pickup_longitude',
+            field=rides.fields.CoordinateField(help_text='Longitude of pickup location', max_degrees=180),
+        ),
+    ]
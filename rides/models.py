@@ -1,7 +1,13 @@
-from django.db import models
+from django.db import connections, models
+from django.db.models.functions import Cast, TruncMonth, TruncYear
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
+from django.contrib.postgres.indexes import BrinIndex
 from django.utils import timezone
+from django.utils.functional import cached_property
 from datetime import timedelta
+import math
+
+from .fields import CoordinateField
 
 
 class CustomUserManager(BaseUserManager):
@@ -21,7 +27,7 @@ class CustomUserManager(BaseUserManager):
         """Create and return a superuser with an email and password."""
         extra_fields.setdefault('is_staff', True)
         extra_fields.setdefault('is_superuser', True)
-        extra_fields.setdefault('role', 'admin')
+        extra_fields.setdefault('role', User.Role.ADMIN)
         
         if extra_fields.get('is_staff') is not True:
             raise ValueError('Superuser must have is_staff=True.')
@@ -37,18 +43,19 @@ class User(AbstractBaseUser, PermissionsMixin):
     Uses email as the unique identifier instead of username.
     """
     
-    ROLE_CHOICES = [
-        ('admin', 'Admin'),
-        ('driver', 'Driver'),
-        ('rider', 'Rider'),
-        ('dispatcher', 'Dispatcher'),
-    ]
+    class Role(models.TextChoices):
+        ADMIN = 'admin', 'Admin'
+        DRIVER = 'driver', 'Driver'
+        RIDER = 'rider', 'Rider'
+        DISPATCHER = 'dispatcher', 'Dispatcher'
+
+    ROLE_CHOICES = Role.choices
     
     id_user = models.AutoField(primary_key=True, help_text="Primary key")
     role = models.CharField(
         max_length=20, 
         choices=ROLE_CHOICES,
-        default='rider',
+        default=Role.RIDER,
         help_text="User role (admin, driver, rider, dispatcher)"
     )
     first_name = models.CharField(max_length=150, help_text="User's first name")
@@ -70,6 +77,14 @@ class User(AbstractBaseUser, PermissionsMixin):
         db_table = 'user'
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            # Admins are a handful of rows; keeps admin lookups off the full role index
+            models.Index(fields=['role'], condition=models.Q(role='admin'), name='user_admin_role_idx'),
+            # Default newest-first ordering of the user list
+            models.Index(fields=['-date_joined'], name='user_date_joined_idx'),
+            # Role and active filters (drivers/riders, stats) in list order; also serves role-only filters
+            models.Index(fields=['role', 'is_active', '-date_joined'], name='user_role_active_idx'),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.email})"
@@ -81,7 +96,74 @@ class User(AbstractBaseUser, PermissionsMixin):
     
     def is_admin(self):
         """Check if user has admin role."""
-        return self.role == 'admin'
+        return self.role == self.Role.ADMIN
+
+
+class RideQuerySet(models.QuerySet):
+    """Custom queryset for Ride with location lookups."""
+
+    def within_box(self, latitude, longitude, radius_km):
+        """
+        Keep rides whose pickup lies in the lat/lng bounding box around a point.
+        A cheap prefilter on the (pickup_latitude, pickup_longitude) index before
+        an exact distance check.
+        """
+        lat_delta = radius_km / 111.32  # km per degree of latitude
+        # Clamped to valid latitudes, so a large radius stays within the column's range
+        low = min(max(latitude - lat_delta, -90.0), 90.0)
+        high = min(max(latitude + lat_delta, -90.0), 90.0)
+        queryset = self.filter(pickup_latitude__range=(low, high))
+        cos_lat = math.cos(math.radians(latitude))
+        if cos_lat > 1e-6:
+            lng_delta = lat_delta / cos_lat
+            # Boxes crossing the antimeridian are left unbounded in longitude
+            if -180 <= longitude - lng_delta and longitude + lng_delta <= 180:
+                queryset = queryset.filter(
+                    pickup_longitude__range=(longitude - lng_delta, longitude + lng_delta)
+                )
+        return queryset
+
+    def with_distance(self, latitude, longitude):
+        """
+        Annotate `distance`, the pickup's distance in kilometers from a point,
+        using the haversine() SQL function so it can be filtered and sorted on.
+        The point's own trig terms are folded into constants by PostgreSQL.
+        """
+        # Cast the stored integers to double precision before scaling; dividing by
+        # the bare literal would do NUMERIC arithmetic on every row
+        scale = models.Value(float(CoordinateField.SCALE))
+        return self.annotate(distance=models.Func(
+            models.Value(latitude),
+            models.Value(longitude),
+            Cast('pickup_latitude', models.FloatField()) / scale,
+            Cast('pickup_longitude', models.FloatField()) / scale,
+            function='haversine',
+            output_field=models.FloatField(),
+        ))
+
+    def with_todays_events_count(self, since=None):
+        """Annotate `todays_events_count`, the number of events since `since` (default: last 24 hours)."""
+        if since is None:
+            since = timezone.now() - timedelta(hours=24)
+        return self.annotate(todays_events_count=models.Count(
+            'ride_events', filter=models.Q(ride_events__created_at__gte=since)
+        ))
+
+    def with_todays_events(self, since=None):
+        """
+        Prefetch each ride's events since `since` (default: last 24 hours) into
+        `todays_events`, so get_todays_ride_events() doesn't query once per ride.
+        """
+        return self.prefetch_related(
+            models.Prefetch('ride_events', queryset=RideEvent.objects.todays_events(since), to_attr='todays_events')
+        )
+
+
+class RideManager(models.Manager.from_queryset(RideQuerySet)):
+    """Default Ride manager; joins rider and driver, which __str__ and the serializers read."""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('id_rider', 'id_driver')
 
 
 class Ride(models.Model):
@@ -117,15 +199,22 @@ class Ride(models.Model):
         related_name='rides_as_driver',
         help_text="Foreign key referencing User(id_user) - the driver"
     )
-    pickup_latitude = models.FloatField(help_text="Latitude of pickup location")
-    pickup_longitude = models.FloatField(help_text="Longitude of pickup location")
-    dropoff_latitude = models.FloatField(help_text="Latitude of dropoff location")
-    dropoff_longitude = models.FloatField(help_text="Longitude of dropoff location")
+    pickup_latitude = CoordinateField(max_degrees=90, help_text="Latitude of pickup location")
+    pickup_longitude = CoordinateField(max_degrees=180, help_text="Longitude of pickup location")
+    dropoff_latitude = CoordinateField(max_degrees=90, help_text="Latitude of dropoff location")
+    dropoff_longitude = CoordinateField(max_degrees=180, help_text="Longitude of dropoff location")
     pickup_time = models.DateTimeField(help_text="Pickup time")
+    # Copies of the users' emails, kept in sync by save() and by rides.signals.
+    # bulk_create(), QuerySet.update() and other bulk writes bypass both, so they
+    # must set rider_email and driver_email themselves.
+    rider_email = models.EmailField(editable=False, default='', help_text="Rider's email (denormalized)")
+    driver_email = models.EmailField(editable=False, default='', help_text="Driver's email (denormalized)")
     
     # Additional fields for better functionality
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = RideManager()
     
     class Meta:
         db_table = 'ride'
@@ -133,15 +222,31 @@ class Ride(models.Model):
         verbose_name_plural = 'Rides'
         ordering = ['-pickup_time']
         indexes = [
-            models.Index(fields=['status']),
             models.Index(fields=['pickup_time']),
-            models.Index(fields=['id_rider']),
-            models.Index(fields=['id_driver']),
             models.Index(fields=['pickup_latitude', 'pickup_longitude']),
+            # Status filters with the default newest-first ordering; also serves status-only filters
+            models.Index(fields=['status', '-pickup_time']),
+            # A driver's live rides; the FK index already covers id_driver in general
+            models.Index(
+                fields=['id_driver'],
+                condition=~models.Q(status__in=['completed', 'cancelled']),
+                name='ride_active_driver_idx',
+            ),
+            # Admin date_hierarchy drilldown: SELECT DISTINCT DATE_TRUNC(...)
+            models.Index(TruncYear('pickup_time'), name='ride_pickup_year_idx'),
+            models.Index(TruncMonth('pickup_time'), name='ride_pickup_month_idx'),
         ]
     
     def __str__(self):
-        return f"Ride {self.id_ride} - {self.status} ({self.id_rider.email} -> {self.id_driver.email})"
+        return f"Ride {self.id_ride} - {self.status} ({self.rider_email} -> {self.driver_email})"
+    
+    def save(self, *args, **kwargs):
+        self.rider_email = self.id_rider.email
+        self.driver_email = self.id_driver.email
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'rider_email', 'driver_email'}
+        super().save(*args, **kwargs)
     
     @property
     def pickup_location(self):
@@ -153,22 +258,26 @@ class Ride(models.Model):
         """Return dropoff coordinates as a tuple."""
         return (self.dropoff_latitude, self.dropoff_longitude)
     
+    @cached_property
+    def _pickup_radians(self):
+        """Pickup latitude and longitude in radians, plus the cosine of the latitude."""
+        lat = math.radians(self.pickup_latitude)
+        return lat, math.radians(self.pickup_longitude), math.cos(lat)
+
     def distance_from_point(self, latitude, longitude):
         """
         Calculate distance from a given point to the pickup location.
         Uses Haversine formula for GPS distance calculation.
         Returns distance in kilometers.
         """
-        import math
-        
         # Convert latitude and longitude from degrees to radians
         lat1, lon1 = math.radians(latitude), math.radians(longitude)
-        lat2, lon2 = math.radians(self.pickup_latitude), math.radians(self.pickup_longitude)
+        lat2, lon2, cos_lat2 = self._pickup_radians
         
         # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
+        sin_dlat = math.sin((lat2 - lat1) / 2)
+        sin_dlon = math.sin((lon2 - lon1) / 2)
+        a = sin_dlat * sin_dlat + math.cos(lat1) * cos_lat2 * sin_dlon * sin_dlon
         c = 2 * math.asin(math.sqrt(a))
         
         # Radius of earth in kilometers
@@ -176,26 +285,62 @@ class Ride(models.Model):
         
         return c * r
 
-    def get_todays_ride_events(self):
+    def get_todays_ride_events(self, since=None):
         """
         Get ride events from the last 24 hours for this ride.
         This is the optimized field mentioned in the specification.
+        Uses the events prefetched by with_todays_events() when available.
         """
-        twenty_four_hours_ago = timezone.now() - timedelta(hours=24)
-        return self.ride_events.filter(created_at__gte=twenty_four_hours_ago)
+        if hasattr(self, 'todays_events'):
+            return self.todays_events
+        if since is None:
+            since = timezone.now() - timedelta(hours=24)
+        return self.ride_events.filter(created_at__gte=since)
 
 
 class RideEventManager(models.Manager):
     """Custom manager for RideEvent with optimized queries."""
     
-    def todays_events(self):
+    def todays_events(self, since=None):
         """Return events from the last 24 hours for performance optimization."""
-        twenty_four_hours_ago = timezone.now() - timedelta(hours=24)
-        return self.filter(created_at__gte=twenty_four_hours_ago)
+        if since is None:
+            since = timezone.now() - timedelta(hours=24)
+        return self.filter(created_at__gte=since)
     
     def for_ride(self, ride_id):
         """Get all events for a specific ride."""
         return self.filter(id_ride_id=ride_id)
+    
+    def descriptions(self):
+        """
+        Return the distinct event descriptions, in order.
+        PostgreSQL has no loose index scan, so SELECT DISTINCT reads every event;
+        this recursive query instead jumps through the description index, one
+        probe per distinct value.
+        """
+        table = connections[self.db].ops.quote_name(self.model._meta.db_table)
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(f"""
+                WITH RECURSIVE t(description) AS (
+                    (SELECT description FROM {table} ORDER BY description LIMIT 1)
+                    UNION ALL
+                    SELECT (
+                        SELECT e.description FROM {table} e
+                        WHERE e.description > t.description
+                        ORDER BY e.description LIMIT 1
+                    )
+                    FROM t WHERE t.description IS NOT NULL
+                )
+                SELECT description FROM t WHERE description IS NOT NULL
+            """)
+            return [row[0] for row in cursor.fetchall()]
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        """Set each event's type from its description, since bulk_create() skips save()."""
+        objs = list(objs)
+        for event in objs:
+            event.event_type = self.model.event_type_for(event.description)
+        return super().bulk_create(objs, *args, **kwargs)
 
 
 class RideEvent(models.Model):
@@ -204,6 +349,11 @@ class RideEvent(models.Model):
     Represents events that occur during a ride (pickup, dropoff, etc.).
     """
     
+    class EventType(models.IntegerChoices):
+        OTHER = 0, 'Other'
+        PICKUP = 1, 'Pickup'
+        DROPOFF = 2, 'Dropoff'
+    
     id_ride_event = models.AutoField(primary_key=True, help_text="Primary key")
     id_ride = models.ForeignKey(
         Ride,
@@ -219,6 +369,12 @@ class RideEvent(models.Model):
         auto_now_add=True,
         help_text="Timestamp of when the event occurred"
     )
+    event_type = models.PositiveSmallIntegerField(
+        choices=EventType.choices,
+        default=EventType.OTHER,
+        editable=False,
+        help_text="Event type, derived from the description on save"
+    )
     
     objects = RideEventManager()
     
@@ -229,8 +385,19 @@ class RideEvent(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['id_ride']),
-            models.Index(fields=['created_at']),
+            # Events are append-only, so created_at follows the physical row order
+            BrinIndex(fields=['created_at'], pages_per_range=32, name='ride_event_created_brin'),
+            # BRIN can't return rows in order; this serves the default newest-first
+            # ordering (list pages, admin changelist, cursor pages) with ORDER BY ... LIMIT,
+            # and covers the columns today's events reads for index-only scans
+            models.Index(fields=['-created_at'], include=('id_ride_event', 'description'), name='ride_event_created_at_idx'),
             models.Index(fields=['id_ride', 'created_at']),  # Compound index for performance
+            models.Index(fields=['event_type', 'created_at']),
+            # Event type stats and listing group by description; also serves the exact-match filter
+            models.Index(fields=['description'], name='ride_event_description_idx'),
+            # Admin date_hierarchy drilldown: SELECT DISTINCT DATE_TRUNC(...)
+            models.Index(TruncYear('created_at'), name='ride_event_created_year_idx'),
+            models.Index(TruncMonth('created_at'), name='ride_event_created_month_idx'),
         ]
     
     def __str__(self):
@@ -245,10 +412,46 @@ class RideEvent(models.Model):
         description = f"Status changed to {new_status}"
         return cls.objects.create(id_ride=ride, description=description)
     
+    @classmethod
+    def event_type_for(cls, description):
+        """Return the event type for a description; pickup takes precedence over dropoff."""
+        description = description.lower()
+        if 'pickup' in description:
+            return cls.EventType.PICKUP
+        if 'dropoff' in description:
+            return cls.EventType.DROPOFF
+        return cls.EventType.OTHER
+    
+    def save(self, *args, **kwargs):
+        self.event_type = self.event_type_for(self.description)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'description' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'event_type'}
+        super().save(*args, **kwargs)
+    
     def is_pickup_event(self):
         """Check if this is a pickup event."""
-        return 'pickup' in self.description.lower()
+        return self.event_type == self.EventType.PICKUP
     
     def is_dropoff_event(self):
         """Check if this is a dropoff event."""
-        return 'dropoff' in self.description.lower()
+        return self.event_type == self.EventType.DROPOFF
+
+
+class RideEventTypeCount(models.Model):
+    """
+    Number of ride events per description, read from the ride_event_type_counts
+    materialized view (created by migration 0019). Refreshed by the
+    refresh_ride_event_type_counts management command, so it may lag behind ride_event.
+    """
+    
+    description = models.CharField(max_length=255, primary_key=True)
+    count = models.PositiveIntegerField()
+    
+    class Meta:
+        managed = False
+        db_table = 'ride_event_type_counts'
+        ordering = ['-count']
+    
+    def __str__(self):
+        return f"{self.description}: {self.count}"
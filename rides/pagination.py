@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+
+class TodaysEventsCursorPagination(CursorPagination):
+    """
+    Keyset pagination for today's events, newest first.
+    Each page seeks past the previous page's last created_at instead of
+    scanning and discarding OFFSET rows; the primary key breaks ties.
+    """
+    
+    ordering = ('-created_at', '-id_ride_event')
+    
+    def get_ordering(self, request, queryset, view):
+        """Always use this fixed ordering; the action takes no ?ordering= parameter."""
+        return self.ordering
@@ -1,6 +1,19 @@
 from rest_framework import permissions
 
 
+def is_admin_request(request):
+    """
+    Return True if the request's user is an authenticated admin.
+    The result is memoized on the request, since object-level checks repeat it.
+    """
+    cached = getattr(request, '_is_admin_cached', None)
+    if cached is None:
+        user = request.user
+        cached = bool(user and user.is_authenticated and user.is_admin())
+        request._is_admin_cached = cached
+    return cached
+
+
 class IsAdminUser(permissions.BasePermission):
     """
     Custom permission to only allow users with 'admin' role to access the API.
@@ -12,12 +25,8 @@ class IsAdminUser(permissions.BasePermission):
         Return True if permission is granted, False otherwise.
         Only authenticated users with 'admin' role are allowed.
         """
-        # User must be authenticated
-        if not request.user or not request.user.is_authenticated:
-            return False
-        
-        # User must have 'admin' role
-        return request.user.role == 'admin'
+        # User must be authenticated and have 'admin' role
+        return is_admin_request(request)
     
     def has_object_permission(self, request, view, obj):
         """
@@ -48,7 +57,7 @@ class IsAdminUserOrReadOnly(permissions.BasePermission):
             return True
         
         # Write permissions only for admin users
-        return request.user.role == 'admin'
+        return is_admin_request(request)
     
     def has_object_permission(self, request, view, obj):
         """
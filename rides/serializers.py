@@ -1,16 +1,41 @@
+from copy import copy
+
 from rest_framework import serializers
 from .models import User, RideEvent, Ride
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 
 
-class UserSerializer(serializers.ModelSerializer):
+ALLOWED_ROLES = frozenset(User.Role.values)
+
+# Formats event timestamps exactly as TodaysRideEventSerializer's created_at field does
+EVENT_TIMESTAMP_FIELD = serializers.DateTimeField()
+
+
+class CachedFieldsMixin:
+    """
+    Build a serializer class's fields once and hand out shallow copies.
+    ModelSerializer otherwise re-introspects the model on every instantiation,
+    including once per nested serializer. The copies are bound to each new parent.
+    """
+    
+    _fields_cache = {}
+    
+    def get_fields(self):
+        fields = self._fields_cache.get(type(self))
+        if fields is None:
+            fields = self._fields_cache[type(self)] = super().get_fields()
+        return {name: copy(field) for name, field in fields.items()}
+
+
+class UserSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for the User model.
     Handles serialization/deserialization of User instances for the API.
     """
     
     full_name = serializers.ReadOnlyField(help_text="User's full name (computed field)")
-    is_admin = serializers.SerializerMethodField(help_text="Whether user has admin role")
+    is_admin = serializers.ReadOnlyField(help_text="Whether user has admin role")
     
     class Meta:
         model = User
@@ -28,22 +53,10 @@ class UserSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id_user', 'date_joined', 'full_name', 'is_admin']
     
-    def get_is_admin(self, obj):
-        """Return whether the user has admin role."""
-        return obj.is_admin()
-    
-    def validate_email(self, value):
-        """Validate email uniqueness."""
-        if User.objects.filter(email=value).exists():
-            if not self.instance or self.instance.email != value:
-                raise serializers.ValidationError("A user with this email already exists.")
-        return value
-    
     def validate_role(self, value):
         """Validate role is one of the allowed choices."""
-        allowed_roles = [choice[0] for choice in User.ROLE_CHOICES]
-        if value not in allowed_roles:
-            raise serializers.ValidationError(f"Role must be one of: {', '.join(allowed_roles)}")
+        if value not in ALLOWED_ROLES:
+            raise serializers.ValidationError(f"Role must be one of: {', '.join(User.Role.values)}")
         return value
 
 
@@ -89,12 +102,16 @@ class UserCreateSerializer(serializers.ModelSerializer):
         # Extract password
         password = validated_data.pop('password')
         
-        # Create user
-        user = User.objects.create_user(password=password, **validated_data)
+        # Create user; the unique index catches an email taken since validation
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(password=password, **validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({'email': ["A user with this email already exists."]})
         return user
 
 
-class UserSummarySerializer(serializers.ModelSerializer):
+class UserSummarySerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for User model when used as nested field.
     Used in Ride serializers to avoid circular imports and reduce payload size.
@@ -115,15 +132,15 @@ class UserSummarySerializer(serializers.ModelSerializer):
         read_only_fields = ['id_user', 'full_name']
 
 
-class RideEventSerializer(serializers.ModelSerializer):
+class RideEventSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for the RideEvent model.
     Handles serialization/deserialization of RideEvent instances.
     """
     
     # Add computed fields
-    is_pickup_event = serializers.SerializerMethodField(help_text="Whether this is a pickup event")
-    is_dropoff_event = serializers.SerializerMethodField(help_text="Whether this is a dropoff event")
+    is_pickup_event = serializers.ReadOnlyField(help_text="Whether this is a pickup event")
+    is_dropoff_event = serializers.ReadOnlyField(help_text="Whether this is a dropoff event")
     time_since_created = serializers.SerializerMethodField(help_text="Time elapsed since event creation")
     
     class Meta:
@@ -139,17 +156,12 @@ class RideEventSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id_ride_event', 'created_at', 'is_pickup_event', 'is_dropoff_event', 'time_since_created']
     
-    def get_is_pickup_event(self, obj):
-        """Return whether this is a pickup event."""
-        return obj.is_pickup_event()
-    
-    def get_is_dropoff_event(self, obj):
-        """Return whether this is a dropoff event."""
-        return obj.is_dropoff_event()
-    
     def get_time_since_created(self, obj):
         """Return time elapsed since event creation in human-readable format."""
-        now = timezone.now()
+        # Read the clock once per response; views may supply it in the context
+        now = self.context.get('now')
+        if now is None:
+            now = self.context.setdefault('now', timezone.now())
         delta = now - obj.created_at
         
         if delta.days > 0:
@@ -184,7 +196,7 @@ class RideEventCreateSerializer(serializers.ModelSerializer):
         return value.strip()
 
 
-class TodaysRideEventSerializer(serializers.ModelSerializer):
+class TodaysRideEventSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Optimized serializer for today's ride events (last 24 hours).
     Used in the Ride serializer for the todays_ride_events field.
@@ -201,7 +213,7 @@ class TodaysRideEventSerializer(serializers.ModelSerializer):
         read_only_fields = ['id_ride_event', 'created_at']
 
 
-class RideSerializer(serializers.ModelSerializer):
+class RideSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Comprehensive serializer for the Ride model.
     Includes nested relationships and the special todays_ride_events field.
@@ -218,8 +230,8 @@ class RideSerializer(serializers.ModelSerializer):
     )
     
     # Computed fields
-    pickup_location = serializers.SerializerMethodField(help_text="Pickup coordinates as [lat, lng]")
-    dropoff_location = serializers.SerializerMethodField(help_text="Dropoff coordinates as [lat, lng]")
+    pickup_location = serializers.ReadOnlyField(help_text="Pickup coordinates as [lat, lng]")
+    dropoff_location = serializers.ReadOnlyField(help_text="Dropoff coordinates as [lat, lng]")
     
     # Distance calculation field (for GPS sorting)
     distance_from_point = serializers.SerializerMethodField(
@@ -259,23 +271,29 @@ class RideSerializer(serializers.ModelSerializer):
         """
         Get ride events from the last 24 hours.
         This implements the performance optimization mentioned in the specification.
+        Builds TodaysRideEventSerializer's three fields directly rather than
+        instantiating a nested serializer for every ride.
         """
-        todays_events = obj.get_todays_ride_events()
-        return TodaysRideEventSerializer(todays_events, many=True).data
-    
-    def get_pickup_location(self, obj):
-        """Return pickup coordinates as [latitude, longitude]."""
-        return [obj.pickup_latitude, obj.pickup_longitude]
-    
-    def get_dropoff_location(self, obj):
-        """Return dropoff coordinates as [latitude, longitude]."""
-        return [obj.dropoff_latitude, obj.dropoff_longitude]
+        todays_events = obj.get_todays_ride_events(self.context.get('today_cutoff'))
+        created_at = EVENT_TIMESTAMP_FIELD.to_representation
+        return [
+            {
+                'id_ride_event': event.id_ride_event,
+                'description': event.description,
+                'created_at': created_at(event.created_at),
+            }
+            for event in todays_events
+        ]
     
     def get_distance_from_point(self, obj):
         """
         Calculate distance from a specified GPS point.
         Only included when GPS sorting is requested.
         """
+        # Use the distance annotated by the database query when there is one
+        distance = getattr(obj, 'distance', None)
+        if distance is not None:
+            return round(distance, 2)
         # Check if GPS coordinates were provided in context
         request = self.context.get('request')
         if request and hasattr(request, 'gps_latitude') and hasattr(request, 'gps_longitude'):
@@ -289,14 +307,13 @@ class RideCreateSerializer(serializers.ModelSerializer):
     Uses user IDs instead of nested objects for creation.
     """
     
-    id_rider = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.filter(role__in=['rider', 'admin']),
-        help_text="ID of the rider user"
-    )
-    id_driver = serializers.PrimaryKeyRelatedField(
-        queryset=User.objects.filter(role__in=['driver', 'admin']),
-        help_text="ID of the driver user"
-    )
+    # Plain IDs, resolved to users together in validate() with a single query
+    id_rider = serializers.IntegerField(help_text="ID of the rider user")
+    id_driver = serializers.IntegerField(help_text="ID of the driver user")
+    
+    # Roles each user may have
+    RIDER_ROLES = frozenset([User.Role.RIDER, User.Role.ADMIN])
+    DRIVER_ROLES = frozenset([User.Role.DRIVER, User.Role.ADMIN])
     
     class Meta:
         model = Ride
@@ -317,36 +334,44 @@ class RideCreateSerializer(serializers.ModelSerializer):
         if attrs['id_rider'] == attrs['id_driver']:
             raise serializers.ValidationError("Rider and driver must be different users.")
         
+        # Look up both users at once
+        users = User.objects.in_bulk([attrs['id_rider'], attrs['id_driver']])
+        errors = {}
+        for field, roles in (('id_rider', self.RIDER_ROLES), ('id_driver', self.DRIVER_ROLES)):
+            user = users.get(attrs[field])
+            if user is None or user.role not in roles:
+                errors[field] = [f'Invalid pk "{attrs[field]}" - object does not exist.']
+            else:
+                attrs[field] = user
+        if errors:
+            raise serializers.ValidationError(errors)
+        
         # Validate coordinates are within reasonable bounds
-        for coord_name, coord_value in [
-            ('pickup_latitude', attrs['pickup_latitude']),
-            ('pickup_longitude', attrs['pickup_longitude']),
-            ('dropoff_latitude', attrs['dropoff_latitude']),
-            ('dropoff_longitude', attrs['dropoff_longitude']),
-        ]:
-            if coord_name.endswith('_latitude'):
-                if not -90 <= coord_value <= 90:
-                    raise serializers.ValidationError(f"{coord_name} must be between -90 and 90 degrees.")
-            else:  # longitude
-                if not -180 <= coord_value <= 180:
-                    raise serializers.ValidationError(f"{coord_name} must be between -180 and 180 degrees.")
+        if not -90 <= attrs['pickup_latitude'] <= 90:
+            raise serializers.ValidationError("pickup_latitude must be between -90 and 90 degrees.")
+        if not -180 <= attrs['pickup_longitude'] <= 180:
+            raise serializers.ValidationError("pickup_longitude must be between -180 and 180 degrees.")
+        if not -90 <= attrs['dropoff_latitude'] <= 90:
+            raise serializers.ValidationError("dropoff_latitude must be between -90 and 90 degrees.")
+        if not -180 <= attrs['dropoff_longitude'] <= 180:
+            raise serializers.ValidationError("dropoff_longitude must be between -180 and 180 degrees.")
         
         return attrs
 
 
-class RideListSerializer(serializers.ModelSerializer):
+class RideListSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """
     Optimized serializer for ride list view.
     Minimal fields for better performance when listing many rides.
     """
     
-    rider_email = serializers.CharField(source='id_rider.email', read_only=True)
-    driver_email = serializers.CharField(source='id_driver.email', read_only=True)
+    rider_email = serializers.CharField(read_only=True)
+    driver_email = serializers.CharField(read_only=True)
     rider_name = serializers.CharField(source='id_rider.full_name', read_only=True)
     driver_name = serializers.CharField(source='id_driver.full_name', read_only=True)
     
-    # Only include today's events count for performance
-    todays_events_count = serializers.SerializerMethodField()
+    # Annotated by RideQuerySet.with_todays_events_count()
+    todays_events_count = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Ride
@@ -362,7 +387,3 @@ class RideListSerializer(serializers.ModelSerializer):
             'pickup_latitude',
             'pickup_longitude',
         ]
-    
-    def get_todays_events_count(self, obj):
-        """Return count of today's events for performance."""
-        return obj.get_todays_ride_events().count()
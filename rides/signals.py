@@ -0,0 +1,63 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import token_cache_key
+from .cache_keys import (
+    EVENT_TYPES_CACHE_KEY, RIDE_EVENT_STATS_CACHE_KEY, USER_STATS_CACHE_KEY, shared_cache_enabled,
+)
+from .etags import invalidate_users_etag
+from .models import Ride, RideEvent, User
+
+
+# User fields that decide whether cached credentials still grant access
+CREDENTIAL_FIELDS = frozenset(['is_active', 'role', 'password'])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_tokens(sender, instance, update_fields=None, **kwargs):
+    """Drop cached credentials for a user's tokens when the user changes."""
+    # Nothing is cached without a shared cache backend
+    if not shared_cache_enabled():
+        return
+    # Saves that only touch other fields (e.g. last_login on login) can't change access
+    if update_fields is not None and not CREDENTIAL_FIELDS.intersection(update_fields):
+        return
+    keys = Token.objects.filter(user_id=instance.pk).values_list('key', flat=True)
+    cache.delete_many([token_cache_key(key) for key in keys])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_users_version(sender, **kwargs):
+    """Expire ETags and cached stats for users when any user changes."""
+    invalidate_users_etag()
+    cache.delete(USER_STATS_CACHE_KEY)
+
+
+@receiver(post_save, sender=RideEvent)
+@receiver(post_delete, sender=RideEvent)
+def invalidate_ride_event_stats(sender, **kwargs):
+    """
+    Drop cached ride event stats and event types when an event changes.
+    With a per-process cache only this worker's copy goes; the others expire
+    theirs after STATS_CACHE_TIMEOUT.
+    """
+    cache.delete_many([RIDE_EVENT_STATS_CACHE_KEY, EVENT_TYPES_CACHE_KEY])
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_token(sender, instance, **kwargs):
+    """Drop cached credentials for a deleted token."""
+    cache.delete(token_cache_key(instance.key))
+
+
+@receiver(post_save, sender=User)
+def sync_ride_emails(sender, instance, created, update_fields=None, **kwargs):
+    """Copy a changed email onto the user's rides."""
+    if created or (update_fields is not None and 'email' not in update_fields):
+        return
+    Ride.objects.filter(id_rider=instance).exclude(rider_email=instance.email).update(rider_email=instance.email)
+    Ride.objects.filter(id_driver=instance).exclude(driver_email=instance.email).update(driver_email=instance.email)
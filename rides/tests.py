@@ -1,3 +1,213 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from .fields import CoordinateField
+from .models import Ride, User
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Token credentials are only cached when every worker shares the cache."""
+    
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user('admin@example.com', 'password123', role='admin')
+        self.token = Token.objects.create(user=self.admin)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+    
+    def test_deactivation_revokes_access_immediately_with_local_cache(self):
+        self.assertEqual(self.client.get('/api/users/stats/').status_code, 200)
+        # Bypass signals, as another worker's write would from this process's view
+        User.objects.filter(pk=self.admin.pk).update(is_active=False)
+        self.assertEqual(self.client.get('/api/users/stats/').status_code, 401)
+    
+    def test_unrelated_update_fields_skip_token_lookup(self):
+        self.admin.first_name = 'Changed'
+        with mock.patch('rides.signals.shared_cache_enabled', return_value=True), self.assertNumQueries(1):
+            self.admin.save(update_fields=['first_name'])
+    
+    def test_access_fields_invalidate_cached_tokens(self):
+        self.admin.is_active = False
+        with mock.patch('rides.signals.shared_cache_enabled', return_value=True), self.assertNumQueries(2):
+            self.admin.save(update_fields=['is_active'])
+
+
+class NearbyRidesTests(TestCase):
+    """Validation of the nearby action's query parameters."""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('admin@example.com', 'password123', role='admin'))
+    
+    def test_non_finite_parameters_are_rejected(self):
+        for params in (
+            {'gps_latitude': '37.7', 'gps_longitude': '-122.4', 'radius': 'nan'},
+            {'gps_latitude': 'inf', 'gps_longitude': '-122.4'},
+            {'gps_latitude': '37.7', 'gps_longitude': '-inf'},
+        ):
+            response = self.client.get('/api/rides/nearby/', params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertEqual(response.data, {'error': 'Invalid GPS coordinates or radius'})
+    
+    def test_finite_parameters_are_accepted(self):
+        response = self.client.get('/api/rides/nearby/', {'gps_latitude': '37.7', 'gps_longitude': '-122.4', 'radius': '5'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 0)
+
+
+class UsersETagTests(TestCase):
+    """The users ETag is only emitted when every worker sees the same users version."""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('admin@example.com', 'password123', role='admin'))
+    
+    def test_no_etag_with_local_cache(self):
+        response = self.client.get('/api/users/drivers/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+    
+    def test_etag_with_shared_cache(self):
+        with mock.patch('rides.etags.shared_cache_enabled', return_value=True):
+            etag = self.client.get('/api/users/drivers/')['ETag']
+            response = self.client.get('/api/users/drivers/', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            
+            User.objects.create_user('driver@example.com', 'password123', role='driver')
+            response = self.client.get('/api/users/drivers/', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+
+
+class CoordinateFieldTests(TestCase):
+    """Coordinates are stored as degrees * SCALE integers and read back as float degrees."""
+    
+    def setUp(self):
+        rider = User.objects.create_user('rider@example.com', 'password123', role='rider')
+        driver = User.objects.create_user('driver@example.com', 'password123', role='driver')
+        self.ride = Ride.objects.create(
+            id_rider=rider, id_driver=driver, pickup_time=timezone.now(),
+            pickup_latitude=37.7749295, pickup_longitude=-122.4194155,
+            dropoff_latitude=-33.8688197, dropoff_longitude=151.2092955,
+        )
+    
+    def test_round_trip(self):
+        ride = Ride.objects.get(pk=self.ride.pk)
+        self.assertEqual(ride.pickup_latitude, 37.7749295)
+        self.assertEqual(ride.pickup_longitude, -122.4194155)
+        self.assertEqual(ride.dropoff_latitude, -33.8688197)
+        self.assertEqual(ride.dropoff_longitude, 151.2092955)
+        
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pickup_latitude FROM ride WHERE id_ride = %s', [self.ride.pk])
+            self.assertEqual(cursor.fetchone()[0], 377749295)
+    
+    def test_range_lookup_is_scaled(self):
+        rides = Ride.objects.filter(pickup_latitude__range=(37.77, 37.78))
+        self.assertEqual(list(rides), [self.ride])
+        self.assertFalse(Ride.objects.filter(pickup_latitude__range=(37.78, 37.79)).exists())
+    
+    def test_with_distance_is_scaled(self):
+        ride = Ride.objects.with_distance(37.7749295, -122.4194155).get(pk=self.ride.pk)
+        self.assertAlmostEqual(ride.distance, 0, places=6)
+        # One degree of latitude is about 111.2 km
+        ride = Ride.objects.with_distance(38.7749295, -122.4194155).get(pk=self.ride.pk)
+        self.assertAlmostEqual(ride.distance, 111.19, places=1)
+        self.assertAlmostEqual(ride.distance, self.ride.distance_from_point(38.7749295, -122.4194155), places=6)
+    
+    def test_within_box_clamps_large_radius(self):
+        self.assertEqual(list(Ride.objects.within_box(37.77, -122.41, 50_000)), [self.ride])
+    
+    def test_unstorable_values_raise(self):
+        for value in (float('nan'), float('inf'), CoordinateField.MAX_DEGREES + 1):
+            with self.assertRaisesMessage(ValueError, 'Coordinate must be a finite number of degrees'):
+                list(Ride.objects.filter(pickup_latitude__lte=value))
+    
+    def test_patch_rejects_out_of_range_and_non_finite_values(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user('admin@example.com', 'password123', role='admin'))
+        url = f'/api/rides/{self.ride.pk}/'
+        for payload in ({'pickup_longitude': 250}, {'pickup_latitude': -91},
+                        {'pickup_longitude': 'nan'}, {'dropoff_latitude': 'inf'}):
+            response = client.patch(url, payload, format='json')
+            self.assertEqual(response.status_code, 400, payload)
+            self.assertIn(next(iter(payload)), response.data)
+        
+        response = client.patch(url, {'pickup_longitude': 179.5}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Ride.objects.get(pk=self.ride.pk).pickup_longitude, 179.5)
+
+
+class CreateTestUsersCommandTests(TestCase):
+    """create_test_users creates missing accounts and leaves existing ones alone."""
+    
+    def test_existing_accounts_are_left_unchanged(self):
+        User.objects.create_user('admin@wingz.com', 'changed-password', role='rider')
+        out = StringIO()
+        call_command('create_test_users', '--create-admin', '--create-test-users', stdout=out)
+        
+        admin = User.objects.get(email='admin@wingz.com')
+        self.assertTrue(admin.check_password('changed-password'))
+        self.assertEqual(admin.role, 'rider')
+        self.assertFalse(admin.is_superuser)
+        self.assertIn('already exists, left unchanged: admin@wingz.com', out.getvalue())
+        
+        self.assertTrue(User.objects.get(email='driver@wingz.com').check_password('driver123'))
+        self.assertIn('Successfully created driver user: driver@wingz.com', out.getvalue())
+
 
-# Create your tests here.
+class RideEmailSyncTests(TestCase):
+    """The denormalized rider_email/driver_email follow the users' emails."""
+    
+    def setUp(self):
+        self.rider = User.objects.create_user('rider@example.com', 'password123', role='rider')
+        self.driver = User.objects.create_user('driver@example.com', 'password123', role='driver')
+        self.ride = Ride.objects.create(
+            id_rider=self.rider, id_driver=self.driver, pickup_time=timezone.now(),
+            pickup_latitude=37.77, pickup_longitude=-122.41,
+            dropoff_latitude=37.78, dropoff_longitude=-122.42,
+        )
+    
+    def test_create_copies_emails(self):
+        self.assertEqual(self.ride.rider_email, 'rider@example.com')
+        self.assertEqual(self.ride.driver_email, 'driver@example.com')
+    
+    def test_user_email_change_propagates_to_rides(self):
+        self.rider.email = 'new-rider@example.com'
+        self.rider.save()
+        self.driver.email = 'new-driver@example.com'
+        self.driver.save(update_fields=['email'])
+        
+        self.ride.refresh_from_db()
+        self.assertEqual(self.ride.rider_email, 'new-rider@example.com')
+        self.assertEqual(self.ride.driver_email, 'new-driver@example.com')
+    
+    def test_unrelated_update_fields_leave_rides_alone(self):
+        User.objects.filter(pk=self.rider.pk).update(email='bulk@example.com')
+        self.rider.first_name = 'Changed'
+        self.rider.save(update_fields=['first_name'])
+        
+        self.ride.refresh_from_db()
+        self.assertEqual(self.ride.rider_email, 'rider@example.com')
+    
+    def test_ride_save_with_update_fields_refreshes_emails(self):
+        # A bulk update skips the signal, leaving the ride's copy stale
+        User.objects.filter(pk=self.rider.pk).update(email='bulk@example.com')
+        ride = Ride.objects.get(pk=self.ride.pk)
+        self.assertEqual(ride.rider_email, 'rider@example.com')
+        
+        ride.status = 'pickup'
+        ride.save(update_fields=['status'])
+        
+        ride.refresh_from_db()
+        self.assertEqual(ride.status, 'pickup')
+        self.assertEqual(ride.rider_email, 'bulk@example.com')
+        self.assertEqual(ride.driver_email, 'driver@example.com')
@@ -7,7 +7,10 @@ from . import views, auth_views
 app_name = 'rides'
 
 # Create a router and register our viewsets with it.
+# Keeps the browsable API root at /api/, but skips the .json/.api format-suffix
+# variant of every route, which roughly halves the URL patterns to resolve.
 router = DefaultRouter()
+router.include_format_suffixes = False
 router.register(r'users', views.UserViewSet, basename='user')
 router.register(r'rides', views.RideViewSet, basename='ride')
 router.register(r'ride-events', views.RideEventViewSet, basename='rideevent')
@@ -1,12 +1,22 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
+from rest_framework.utils.encoders import JSONEncoder
 from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.core.cache import cache
+from django.db.models import Count, Prefetch, Q
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import etag
+from datetime import datetime, time, timedelta
+from hashlib import md5
+import json
+import math
 
-from .models import User, Ride, RideEvent
+from .models import User, Ride, RideEvent, RideEventTypeCount
 from .serializers import (
     UserSerializer, 
     UserCreateSerializer, 
@@ -19,6 +29,35 @@ from .serializers import (
     TodaysRideEventSerializer,
 )
 from .permissions import IsAdminUser, IsAdminUserOrReadOnly
+from .cache_keys import EVENT_TYPES_CACHE_KEY, RIDE_EVENT_STATS_CACHE_KEY, USER_STATS_CACHE_KEY, shared_cache_enabled
+from .etags import USERS_ETAG_TIMEOUT, users_etag, users_version
+from .counts import ESTIMATE_THRESHOLD, estimated_row_count
+from .filters import RideEventFilter, parse_iso_datetime
+from .pagination import TodaysEventsCursorPagination
+
+
+# Cached stats responses; dropped on writes (see rides.signals). The timeout bounds
+# staleness after bulk writes, for the rolling 24-hour/7-day windows, and in other
+# workers when the cache is per-process (LocMemCache): there the signals only drop
+# the writing worker's copy, so a change can take up to this long to show everywhere.
+STATS_CACHE_TIMEOUT = 60
+
+# Columns read by UserSummarySerializer and RideListSerializer; list views load only these
+USER_SUMMARY_COLUMNS = ('id_user', 'email', 'first_name', 'last_name', 'role')
+RIDE_LIST_COLUMNS = (
+    'id_ride', 'status', 'rider_email', 'driver_email', 'pickup_time',
+    'pickup_latitude', 'pickup_longitude',
+    'id_rider__first_name', 'id_rider__last_name',
+    'id_driver__first_name', 'id_driver__last_name',
+)
+# RideSerializer reads every ride column, but only the summary columns of its rider and driver
+RIDE_DETAIL_COLUMNS = (
+    'id_ride', 'status', 'pickup_latitude', 'pickup_longitude',
+    'dropoff_latitude', 'dropoff_longitude', 'pickup_time',
+    'rider_email', 'driver_email', 'created_at', 'updated_at',
+    *(f'id_rider__{column}' for column in USER_SUMMARY_COLUMNS),
+    *(f'id_driver__{column}' for column in USER_SUMMARY_COLUMNS),
+)
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -49,21 +88,12 @@ class UserViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """
-        Optionally filter users by role or active status.
+        Load only the summary columns for the list view.
+        Role and active status filtering is handled by DjangoFilterBackend.
         """
         queryset = User.objects.all()
-        
-        # Filter by role if specified
-        role = self.request.query_params.get('role', None)
-        if role and role in ['admin', 'driver', 'rider']:
-            queryset = queryset.filter(role=role)
-        
-        # Filter by active status if specified
-        is_active = self.request.query_params.get('is_active', None)
-        if is_active is not None:
-            is_active_bool = is_active.lower() in ['true', '1', 'yes']
-            queryset = queryset.filter(is_active=is_active_bool)
-        
+        if self.action == 'list':
+            queryset = queryset.only(*USER_SUMMARY_COLUMNS)
         return queryset
     
     def create(self, request, *args, **kwargs):
@@ -86,9 +116,10 @@ class UserViewSet(viewsets.ModelViewSet):
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+        serializer.save()
         
-        return Response(UserSerializer(user).data)
+        # The update serializer is also the read serializer, so reuse its output
+        return Response(serializer.data)
     
     def destroy(self, request, *args, **kwargs):
         """
@@ -96,7 +127,8 @@ class UserViewSet(viewsets.ModelViewSet):
         """
         instance = self.get_object()
         instance.is_active = False
-        instance.save()
+        # Write only the flag; signals still drop the user's cached tokens
+        instance.save(update_fields=['is_active'])
         
         return Response(
             {'message': f'User {instance.email} has been deactivated successfully.'}, 
@@ -110,7 +142,7 @@ class UserViewSet(viewsets.ModelViewSet):
         """
         user = self.get_object()
         user.is_active = True
-        user.save()
+        user.save(update_fields=['is_active'])
         
         return Response(
             {'message': f'User {user.email} has been activated successfully.'}, 
@@ -118,22 +150,59 @@ class UserViewSet(viewsets.ModelViewSet):
         )
     
     @action(detail=False, methods=['get'])
+    @method_decorator(etag(users_etag))
     def drivers(self, request):
         """
         Get all users with driver role.
         """
-        drivers = User.objects.filter(role='driver', is_active=True)
-        serializer = UserSummarySerializer(drivers, many=True)
-        return Response(serializer.data)
+        return self._active_users_response('driver')
     
     @action(detail=False, methods=['get'])
+    @method_decorator(etag(users_etag))
     def riders(self, request):
         """
         Get all users with rider role.
         """
-        riders = User.objects.filter(role='rider', is_active=True)
-        serializer = UserSummarySerializer(riders, many=True)
-        return Response(serializer.data)
+        return self._active_users_response('rider')
+    
+    def _active_users_response(self, role):
+        """
+        Paginated active users with the given role, shaped like UserSummarySerializer.
+        Built from values() rows, skipping model instances and serializer field dispatch.
+        Cached per users version and URL, so any user change starts a fresh entry.
+        Only cached with a shared cache: a per-process cache would start the new
+        version in the writing worker alone, leaving the others serving old pages.
+        """
+        if not shared_cache_enabled():
+            return Response(self._active_users_data(role))
+        url = self.request.build_absolute_uri()
+        cache_key = f"users:{role}:{users_version()}:{md5(url.encode()).hexdigest()}"
+        data = cache.get(cache_key)
+        if data is None:
+            data = self._active_users_data(role)
+            cache.set(cache_key, data, USERS_ETAG_TIMEOUT)
+        return Response(data)
+    
+    def _active_users_data(self, role):
+        users = User.objects.filter(
+            role=role, is_active=True
+        ).values(*USER_SUMMARY_COLUMNS).order_by('-date_joined')
+        
+        page = self.paginate_queryset(users)
+        rows = [
+            {
+                'id_user': user['id_user'],
+                'email': user['email'],
+                'first_name': user['first_name'],
+                'last_name': user['last_name'],
+                'full_name': f"{user['first_name']} {user['last_name']}".strip(),
+                'role': user['role'],
+            }
+            for user in (page if page is not None else users)
+        ]
+        if page is not None:
+            return self.get_paginated_response(rows).data
+        return rows
     
     @action(detail=True, methods=['get'])
     def rides(self, request, pk=None):
@@ -143,30 +212,43 @@ class UserViewSet(viewsets.ModelViewSet):
         user = self.get_object()
         rides = Ride.objects.filter(
             Q(id_rider=user) | Q(id_driver=user)
-        ).order_by('-pickup_time')
+        ).with_todays_events_count().only(*RIDE_LIST_COLUMNS).order_by('-pickup_time')
+        
+        # A user can have thousands of rides; serialize one page at a time
+        page = self.paginate_queryset(rides)
+        if page is not None:
+            serializer = RideListSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         
         serializer = RideListSerializer(rides, many=True)
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
+    @method_decorator(etag(users_etag))
     def stats(self, request):
         """
         Get user statistics.
         """
-        total_users = User.objects.count()
-        active_users = User.objects.filter(is_active=True).count()
-        drivers = User.objects.filter(role='driver', is_active=True).count()
-        riders = User.objects.filter(role='rider', is_active=True).count()
-        admins = User.objects.filter(role='admin', is_active=True).count()
+        return Response(cache.get_or_set(USER_STATS_CACHE_KEY, self._compute_stats, STATS_CACHE_TIMEOUT))
+    
+    def _compute_stats(self):
+        # All counts in a single pass over the table
+        counts = User.objects.aggregate(
+            total=Count('pk'),
+            active=Count('pk', filter=Q(is_active=True)),
+            drivers=Count('pk', filter=Q(role='driver', is_active=True)),
+            riders=Count('pk', filter=Q(role='rider', is_active=True)),
+            admins=Count('pk', filter=Q(role='admin', is_active=True)),
+        )
         
-        return Response({
-            'total_users': total_users,
-            'active_users': active_users,
-            'drivers': drivers,
-            'riders': riders,
-            'admins': admins,
-            'inactive_users': total_users - active_users,
-        })
+        return {
+            'total_users': counts['total'],
+            'active_users': counts['active'],
+            'drivers': counts['drivers'],
+            'riders': counts['riders'],
+            'admins': counts['admins'],
+            'inactive_users': counts['total'] - counts['active'],
+        }
 
 
 class RideEventViewSet(viewsets.ModelViewSet):
@@ -176,13 +258,15 @@ class RideEventViewSet(viewsets.ModelViewSet):
     Only accessible by admin users as per specification.
     """
     
-    queryset = RideEvent.objects.select_related('id_ride', 'id_ride__id_rider', 'id_ride__id_driver').all()
+    # The event serializers only read id_ride's primary key, so no joins are needed
+    queryset = RideEvent.objects.all()
     permission_classes = [IsAuthenticated, IsAdminUser]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     
-    # Filtering options
-    filterset_fields = ['description', 'id_ride', 'id_ride__status']
-    search_fields = ['description', 'id_ride__id_rider__email', 'id_ride__id_driver__email']
+    # Filtering options (ride_id, description, start_date/end_date, id_ride, id_ride__status)
+    filterset_class = RideEventFilter
+    # Denormalized emails on the ride, so searching joins the ride but not its users
+    search_fields = ['description', 'id_ride__rider_email', 'id_ride__driver_email']
     ordering_fields = ['id_ride_event', 'created_at', 'description']
     ordering = ['-created_at']  # Default ordering by most recent events
     
@@ -196,47 +280,13 @@ class RideEventViewSet(viewsets.ModelViewSet):
             return TodaysRideEventSerializer
         return RideEventSerializer
     
-    def get_queryset(self):
+    def get_serializer_context(self):
         """
-        Optimized queryset with filtering options.
+        Add the current time, so event ages are computed against one clock read per request.
         """
-        queryset = RideEvent.objects.select_related(
-            'id_ride', 
-            'id_ride__id_rider', 
-            'id_ride__id_driver'
-        ).all()
-        
-        # Filter by ride ID if specified
-        ride_id = self.request.query_params.get('ride_id', None)
-        if ride_id:
-            queryset = queryset.filter(id_ride=ride_id)
-        
-        # Filter by event type if specified
-        description = self.request.query_params.get('description', None)
-        if description:
-            queryset = queryset.filter(description__icontains=description)
-        
-        # Filter by date range if specified
-        start_date = self.request.query_params.get('start_date', None)
-        end_date = self.request.query_params.get('end_date', None)
-        
-        if start_date:
-            try:
-                from datetime import datetime
-                start_datetime = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-                queryset = queryset.filter(created_at__gte=start_datetime)
-            except ValueError:
-                pass  # Invalid date format, ignore filter
-        
-        if end_date:
-            try:
-                from datetime import datetime
-                end_datetime = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-                queryset = queryset.filter(created_at__lte=end_datetime)
-            except ValueError:
-                pass  # Invalid date format, ignore filter
-        
-        return queryset
+        context = super().get_serializer_context()
+        context['now'] = timezone.now()
+        return context
     
     def create(self, request, *args, **kwargs):
         """
@@ -258,26 +308,31 @@ class RideEventViewSet(viewsets.ModelViewSet):
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
-        ride_event = serializer.save()
+        serializer.save()
         
-        return Response(RideEventSerializer(ride_event).data)
+        # The update serializer is also the read serializer, so reuse its output
+        return Response(serializer.data)
     
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], pagination_class=TodaysEventsCursorPagination)
     def todays_events(self, request):
         """
         Get all ride events from today with performance optimization.
         This is the optimized endpoint mentioned in the specification.
         """
-        from datetime import datetime, timezone, timedelta
-        
-        # Get events from the last 24 hours
-        twenty_four_hours_ago = datetime.now(timezone.utc) - timedelta(hours=24)
-        
-        todays_events = self.get_queryset().filter(
-            created_at__gte=twenty_four_hours_ago
+        # Events from the last 24 hours, built directly from the manager; this
+        # action takes no list filters. TodaysRideEventSerializer reads only these columns.
+        todays_events = RideEvent.objects.todays_events().only(
+            'id_ride_event', 'description', 'created_at'
         ).order_by('-created_at')
         
-        # Apply pagination for performance
+        # Exports can stream every event as NDJSON, reading rows through a server-side cursor
+        if request.query_params.get('stream') == '1':
+            return StreamingHttpResponse(
+                self._stream_events(todays_events),
+                content_type='application/x-ndjson',
+            )
+        
+        # Cursor pagination, so deep pages seek instead of skipping rows
         page = self.paginate_queryset(todays_events)
         if page is not None:
             serializer = TodaysRideEventSerializer(page, many=True)
@@ -286,6 +341,12 @@ class RideEventViewSet(viewsets.ModelViewSet):
         serializer = TodaysRideEventSerializer(todays_events, many=True)
         return Response(serializer.data)
     
+    def _stream_events(self, events):
+        """Yield one JSON line per event, serialized with a single TodaysRideEventSerializer."""
+        serializer = TodaysRideEventSerializer()
+        for event in events.iterator(chunk_size=2000):
+            yield json.dumps(serializer.to_representation(event), cls=JSONEncoder) + '\n'
+    
     @action(detail=False, methods=['get'])
     def by_ride(self, request):
         """
@@ -298,16 +359,20 @@ class RideEventViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        try:
-            ride = Ride.objects.get(id_ride=ride_id)
-        except Ride.DoesNotExist:
+        events = self.get_queryset().filter(id_ride_id=ride_id).order_by('created_at')
+        page = self.paginate_queryset(events)
+        rows = page if page is not None else list(events)
+        
+        # Only an empty result needs to tell a ride without events from a missing ride
+        if not rows and not Ride.objects.filter(id_ride=ride_id).exists():
             return Response(
                 {'error': 'Ride not found'}, 
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        events = self.get_queryset().filter(id_ride=ride).order_by('created_at')
-        serializer = RideEventSerializer(events, many=True)
+        serializer = RideEventSerializer(rows, many=True, context=self.get_serializer_context())
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
@@ -315,44 +380,60 @@ class RideEventViewSet(viewsets.ModelViewSet):
         """
         Get all unique event types (descriptions) in the system.
         """
-        event_types = RideEvent.objects.values_list(
-            'description', flat=True
-        ).distinct().order_by('description')
+        return Response(cache.get_or_set(EVENT_TYPES_CACHE_KEY, self._compute_event_types, STATS_CACHE_TIMEOUT))
+    
+    def _compute_event_types(self):
+        # Distinct descriptions by skipping through the description index; count from the list
+        event_types = RideEvent.objects.descriptions()
         
-        return Response({
-            'event_types': list(event_types),
+        return {
+            'event_types': event_types,
             'count': len(event_types)
-        })
+        }
     
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """
         Get ride event statistics.
         """
-        from datetime import datetime, timezone, timedelta
-        
-        total_events = RideEvent.objects.count()
-        
-        # Events from last 24 hours
-        twenty_four_hours_ago = datetime.now(timezone.utc) - timedelta(hours=24)
-        todays_events = RideEvent.objects.filter(created_at__gte=twenty_four_hours_ago).count()
-        
-        # Events from last 7 days
-        seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
-        weekly_events = RideEvent.objects.filter(created_at__gte=seven_days_ago).count()
+        return Response(cache.get_or_set(RIDE_EVENT_STATS_CACHE_KEY, self._compute_stats, STATS_CACHE_TIMEOUT))
+    
+    def _compute_stats(self):
+        now = timezone.now()
+        seven_days_ago = now - timedelta(days=7)
         
-        # Most common event types
-        from django.db.models import Count
-        common_event_types = RideEvent.objects.values('description').annotate(
-            count=Count('description')
-        ).order_by('-count')[:5]
+        # Large tables report the planner's row estimate as the total, and only the
+        # last 7 days are counted exactly (a BRIN range scan on created_at)
+        estimate = estimated_row_count(RideEvent)
+        if estimate >= ESTIMATE_THRESHOLD:
+            counts = RideEvent.objects.filter(created_at__gte=seven_days_ago).aggregate(
+                today=Count('pk', filter=Q(created_at__gte=now - timedelta(hours=24))),
+                week=Count('pk'),
+            )
+            counts['total'] = estimate
+        else:
+            # Total, last 24 hours and last 7 days in a single pass over the table
+            counts = RideEvent.objects.aggregate(
+                total=Count('pk'),
+                today=Count('pk', filter=Q(created_at__gte=now - timedelta(hours=24))),
+                week=Count('pk', filter=Q(created_at__gte=seven_days_ago)),
+            )
         
-        return Response({
-            'total_events': total_events,
-            'todays_events': todays_events,
-            'weekly_events': weekly_events,
+        # Most common event types. Large tables read them from the materialized
+        # view (see refresh_ride_event_type_counts) instead of grouping every event.
+        if estimate >= ESTIMATE_THRESHOLD:
+            common_event_types = RideEventTypeCount.objects.values('description', 'count')[:5]
+        else:
+            common_event_types = RideEvent.objects.values('description').annotate(
+                count=Count('description')
+            ).order_by('-count')[:5]
+        
+        return {
+            'total_events': counts['total'],
+            'todays_events': counts['today'],
+            'weekly_events': counts['week'],
             'most_common_event_types': list(common_event_types),
-        })
+        }
 
 
 class RideViewSet(viewsets.ModelViewSet):
@@ -362,7 +443,7 @@ class RideViewSet(viewsets.ModelViewSet):
     Only accessible by admin users as per specification.
     """
     
-    queryset = Ride.objects.select_related('id_rider', 'id_driver').prefetch_related('ride_events').all()
+    queryset = Ride.objects.with_todays_events()
     permission_classes = [IsAuthenticated, IsAdminUser]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     
@@ -385,11 +466,22 @@ class RideViewSet(viewsets.ModelViewSet):
             return RideListSerializer
         return RideSerializer
     
+    def get_today_cutoff(self):
+        """Start of the 24-hour window for today's events, computed once per request."""
+        if not hasattr(self, '_today_cutoff'):
+            self._today_cutoff = timezone.now() - timedelta(hours=24)
+        return self._today_cutoff
+    
     def get_serializer_context(self):
         """
         Add GPS coordinates to serializer context for distance calculations.
+        Built once per request; create serializes its response with the same context.
         """
+        if hasattr(self, '_serializer_context'):
+            return self._serializer_context
+        
         context = super().get_serializer_context()
+        context['today_cutoff'] = self.get_today_cutoff()
         
         # Add GPS coordinates from request parameters for distance calculations
         gps_lat = self.request.query_params.get('gps_latitude')
@@ -402,78 +494,68 @@ class RideViewSet(viewsets.ModelViewSet):
             except (ValueError, TypeError):
                 pass  # Invalid GPS coordinates, ignore
         
+        self._serializer_context = context
         return context
     
     def get_queryset(self):
         """
         Optimized queryset with GPS sorting and filtering options.
         """
-        queryset = Ride.objects.select_related(
-            'id_rider', 
-            'id_driver'
-        ).prefetch_related('ride_events').all()
-        
-        # Filter by status if specified
-        status_filter = self.request.query_params.get('status', None)
+        # The default manager joins rider and driver. List views only show a count of
+        # today's events; destroy serializes nothing; the others serialize the events themselves.
+        cutoff = self.get_today_cutoff()
+        if self.action in ('list', 'nearby', 'active'):
+            queryset = Ride.objects.with_todays_events_count(cutoff).only(*RIDE_LIST_COLUMNS)
+        elif self.action == 'destroy':
+            queryset = Ride.objects.all()
+        elif self.action == 'events':
+            # All of the ride's events in one prefetch; today's are picked from them in Python
+            queryset = Ride.objects.prefetch_related(Prefetch(
+                'ride_events', queryset=RideEvent.objects.order_by('created_at'), to_attr='all_events'
+            ))
+        else:
+            queryset = Ride.objects.with_todays_events(cutoff).only(*RIDE_DETAIL_COLUMNS)
+        
+        # Collect the optional filters into one Q, so the queryset is cloned once
+        params = self.request.query_params
+        filters = Q()
+        
+        # Filter by status, rider and driver if specified
+        status_filter = params.get('status')
         if status_filter:
-            queryset = queryset.filter(status=status_filter)
-        
-        # Filter by rider if specified
-        rider_id = self.request.query_params.get('rider_id', None)
+            filters &= Q(status=status_filter)
+        rider_id = params.get('rider_id')
         if rider_id:
-            queryset = queryset.filter(id_rider=rider_id)
-        
-        # Filter by driver if specified
-        driver_id = self.request.query_params.get('driver_id', None)
+            filters &= Q(id_rider=rider_id)
+        driver_id = params.get('driver_id')
         if driver_id:
-            queryset = queryset.filter(id_driver=driver_id)
-        
-        # Filter by date range if specified
-        start_date = self.request.query_params.get('start_date', None)
-        end_date = self.request.query_params.get('end_date', None)
+            filters &= Q(id_driver=driver_id)
         
-        if start_date:
-            try:
-                from datetime import datetime
-                start_datetime = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-                queryset = queryset.filter(pickup_time__gte=start_datetime)
-            except ValueError:
-                pass
+        # Filter by date range if specified; invalid dates are ignored
+        start_date = params.get('start_date')
+        start_datetime = parse_iso_datetime(start_date) if start_date else None
+        if start_datetime is not None:
+            filters &= Q(pickup_time__gte=start_datetime)
+        end_date = params.get('end_date')
+        end_datetime = parse_iso_datetime(end_date) if end_date else None
+        if end_datetime is not None:
+            filters &= Q(pickup_time__lte=end_datetime)
         
-        if end_date:
-            try:
-                from datetime import datetime
-                end_datetime = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-                queryset = queryset.filter(pickup_time__lte=end_datetime)
-            except ValueError:
-                pass
+        if filters:
+            queryset = queryset.filter(filters)
         
         # GPS sorting if coordinates provided
-        gps_lat = self.request.query_params.get('gps_latitude')
-        gps_lng = self.request.query_params.get('gps_longitude')
+        gps_lat = params.get('gps_latitude')
+        gps_lng = params.get('gps_longitude')
         
-        if gps_lat and gps_lng:
+        # Skipped for writes, where the coordinates may change after the query
+        if gps_lat and gps_lng and self.request.method in SAFE_METHODS:
             try:
                 lat = float(gps_lat)
                 lng = float(gps_lng)
                 
-                # Add distance annotation for sorting
-                from django.db.models import Case, When, FloatField
-                from django.db.models.functions import Sqrt, Power
-                
-                # Calculate distance using Haversine approximation
-                queryset = queryset.extra(
-                    select={
-                        'distance': '''
-                            6371 * acos(
-                                cos(radians(%s)) * cos(radians(pickup_latitude)) *
-                                cos(radians(pickup_longitude) - radians(%s)) +
-                                sin(radians(%s)) * sin(radians(pickup_latitude))
-                            )
-                        '''
-                    },
-                    select_params=[lat, lng, lat]
-                ).order_by('distance')
+                # Add distance annotation for sorting (Haversine, computed in the database)
+                queryset = queryset.with_distance(lat, lng).order_by('distance')
                 
             except (ValueError, TypeError):
                 pass  # Invalid GPS coordinates, ignore sorting
@@ -500,9 +582,10 @@ class RideViewSet(viewsets.ModelViewSet):
         instance = self.get_object()
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
-        ride = serializer.save()
+        serializer.save()
         
-        return Response(RideSerializer(ride, context=self.get_serializer_context()).data)
+        # The update serializer is also the read serializer, so reuse its output
+        return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
     def nearby(self, request):
@@ -524,34 +607,28 @@ class RideViewSet(viewsets.ModelViewSet):
             lat = float(gps_lat)
             lng = float(gps_lng)
             radius_km = float(radius)
+            # float() accepts 'nan' and 'inf', which no coordinate lookup can use
+            if not all(math.isfinite(value) for value in (lat, lng, radius_km)):
+                raise ValueError
         except (ValueError, TypeError):
             return Response(
                 {'error': 'Invalid GPS coordinates or radius'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Find rides within radius using Haversine formula
-        nearby_rides = self.get_queryset().extra(
-            select={
-                'distance': '''
-                    6371 * acos(
-                        cos(radians(%s)) * cos(radians(pickup_latitude)) *
-                        cos(radians(pickup_longitude) - radians(%s)) +
-                        sin(radians(%s)) * sin(radians(pickup_latitude))
-                    )
-                '''
-            },
-            select_params=[lat, lng, lat],
-            where=['6371 * acos(cos(radians(%s)) * cos(radians(pickup_latitude)) * cos(radians(pickup_longitude) - radians(%s)) + sin(radians(%s)) * sin(radians(pickup_latitude))) <= %s'],
-            params=[lat, lng, lat, radius_km]
+        # Find rides within radius using Haversine formula, after an indexed bounding-box prefilter
+        nearby_rides = self.get_queryset().within_box(lat, lng, radius_km).with_distance(lat, lng).filter(
+            distance__lte=radius_km
         ).order_by('distance')
         
+        # Run the distance query once; the count comes from the fetched rows
+        nearby_rides = list(nearby_rides)
         serializer = RideListSerializer(nearby_rides, many=True, context=self.get_serializer_context())
         return Response({
             'rides': serializer.data,
             'center_point': {'latitude': lat, 'longitude': lng},
             'radius_km': radius_km,
-            'count': nearby_rides.count()
+            'count': len(nearby_rides)
         })
     
     @action(detail=True, methods=['get'])
@@ -561,18 +638,19 @@ class RideViewSet(viewsets.ModelViewSet):
         """
         ride = self.get_object()
         
-        # Get all events
-        all_events = ride.ride_events.all().order_by('created_at')
+        # All events, oldest first, prefetched by get_queryset()
+        all_events = ride.all_events
         
-        # Get today's events
-        todays_events = ride.get_todays_ride_events()
+        # Today's events, newest first
+        cutoff = self.get_today_cutoff()
+        todays_events = [event for event in reversed(all_events) if event.created_at >= cutoff]
         
         return Response({
             'ride_id': ride.id_ride,
             'all_events': RideEventSerializer(all_events, many=True).data,
             'todays_events': TodaysRideEventSerializer(todays_events, many=True).data,
-            'todays_events_count': todays_events.count(),
-            'total_events_count': all_events.count(),
+            'todays_events_count': len(todays_events),
+            'total_events_count': len(all_events),
         })
     
     @action(detail=False, methods=['get'])
@@ -589,28 +667,37 @@ class RideViewSet(viewsets.ModelViewSet):
         """
         Get ride statistics with breakdown by status.
         """
-        from django.db.models import Count
-        from datetime import datetime, timezone, timedelta
-        
-        # Overall stats
-        total_rides = Ride.objects.count()
-        
-        # Status breakdown
-        status_stats = Ride.objects.values('status').annotate(
-            count=Count('status')
-        ).order_by('status')
-        
-        # Recent rides (last 7 days)
-        seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
-        recent_rides = Ride.objects.filter(pickup_time__gte=seven_days_ago).count()
+        # One clock reading, so the 7-day and today counts agree
+        now = timezone.now()
+        seven_days_ago = now - timedelta(days=7)
+        # Today as a half-open range from local midnight, compared with pickup_time
+        # directly rather than casting every row's pickup_time to a date. Counted in
+        # its own query so the range can be read from the pickup_time index instead
+        # of being a FILTER on the full-table pass below.
+        today_start = timezone.make_aware(datetime.combine(timezone.localdate(now), time.min))
+        tomorrow_start = timezone.make_aware(datetime.combine(today_start.date() + timedelta(days=1), time.min))
+        todays_rides = Ride.objects.filter(pickup_time__gte=today_start, pickup_time__lt=tomorrow_start).count()
+        
+        # Total, recent (last 7 days) and per-status counts in a single pass
+        counts = Ride.objects.aggregate(
+            total=Count('pk'),
+            recent=Count('pk', filter=Q(pickup_time__gte=seven_days_ago)),
+            **{
+                f'status_{value}': Count('pk', filter=Q(status=value))
+                for value, _ in Ride.STATUS_CHOICES
+            },
+        )
         
-        # Today's rides
-        today = datetime.now(timezone.utc).date()
-        todays_rides = Ride.objects.filter(pickup_time__date=today).count()
+        # Status breakdown, listing only statuses that have rides, in status order
+        status_stats = [
+            {'status': value, 'count': counts[f'status_{value}']}
+            for value in sorted(value for value, _ in Ride.STATUS_CHOICES)
+            if counts[f'status_{value}']
+        ]
         
         return Response({
-            'total_rides': total_rides,
+            'total_rides': counts['total'],
             'todays_rides': todays_rides,
-            'recent_rides': recent_rides,
-            'status_breakdown': list(status_stats),
+            'recent_rides': counts['recent'],
+            'status_breakdown': status_stats,
         })